@@ -1,8 +1,18 @@
 import streamlit as st
 import pandas as pd
 import os
-import subprocess, tempfile, textwrap, hashlib
-from datetime import datetime
+import sys
+import json
+import queue
+import signal
+import collections
+import itertools
+import sqlite3
+import threading
+import time
+import subprocess, textwrap, hashlib, hmac, dis, builtins, types
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 
 # ---------------------------------------------------------
 # CONFIGURATION
@@ -10,77 +20,409 @@ from datetime import datetime
 st.set_page_config(page_title="☁️ Cloud Virtual Laboratory", layout="wide")
 
 DATA_DIR = "data"
+DB_PATH = os.path.join(DATA_DIR, "app.db")
+# Legacy CSV storage, imported into the database the first time it is created.
 USERS_CSV = os.path.join(DATA_DIR, "users.csv")
 LABS_CSV = os.path.join(DATA_DIR, "labs.csv")
 SESSIONS_CSV = os.path.join(DATA_DIR, "lab_sessions.csv")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# The fork server needs os.fork; elsewhere (Windows) every run starts a new
+# interpreter instead.
+HAVE_FORK = hasattr(os, "fork")
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lab_worker.py")
+# Extra seconds to wait for the worker beyond a run's own timeout, which the
+# worker enforces itself, before treating the worker as hung.
+WORKER_GRACE = 5
+# Clean outputs remembered for resubmitted code, least recently used evicted
+# first.
+OUTPUT_CACHE_SIZE = 256
+# Builtins that cannot reach the outside world or tell one run from another.
+# Lab code calling anything else (open, input, id, globals, ...) is not cached.
+PURE_BUILTINS = frozenset({
+    "abs", "all", "any", "ascii", "bin", "bool", "bytearray", "bytes",
+    "callable", "chr", "classmethod", "complex", "dict", "divmod", "enumerate",
+    "filter", "float", "format", "frozenset", "hex", "int", "isinstance",
+    "issubclass", "iter", "len", "list", "map", "max", "min", "next", "object",
+    "oct", "ord", "pow", "print", "property", "range", "repr", "reversed",
+    "round", "set", "slice", "sorted", "staticmethod", "str", "sum", "super",
+    "tuple", "type", "zip",
+    "ArithmeticError", "AssertionError", "AttributeError", "Exception",
+    "IndexError", "KeyError", "LookupError", "NameError", "NotImplementedError",
+    "OverflowError", "RecursionError", "RuntimeError", "StopIteration",
+    "TypeError", "ValueError", "ZeroDivisionError",
+})
+# Attribute prefixes leading to dunders, frames, tracebacks or code objects,
+# and from there to builtins such as open.
+HIDDEN_ATTR_PREFIXES = ("_", "gi_", "cr_", "ag_", "f_", "tb_", "co_")
+
+# Submissions per page on the grading dashboard.
+GRADING_PAGE_SIZE = 50
+
+# Argon2id cost parameters (OWASP baseline); raise time_cost/memory_cost to
+# trade login latency for resistance against offline cracking.
+PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    email TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    role TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS labs (
+    lab_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    expected_output TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    lab_id INTEGER NOT NULL,
+    code TEXT,
+    output TEXT,
+    score INTEGER,
+    timestamp INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions(user_id);
+CREATE INDEX IF NOT EXISTS ix_sessions_lab_id ON sessions(lab_id);
+CREATE INDEX IF NOT EXISTS ix_sessions_timestamp ON sessions(timestamp);
+"""
+
 # ---------------------------------------------------------
 # HELPER FUNCTIONS
 # ---------------------------------------------------------
 def hash_password(password):
-    """Securely hash a password using SHA256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Securely hash a password using salted Argon2id."""
+    return PASSWORD_HASHER.hash(password)
+
+
+def verify_password(stored_hash, password):
+    """Check a password against a stored hash.
+
+    Accounts created before the switch to Argon2 still hold an unsalted
+    SHA256 hex digest, which is compared in constant time.
+    """
+    stored_hash = str(stored_hash)
+    try:
+        return PASSWORD_HASHER.verify(stored_hash, password)
+    except VerificationError:
+        # A wrong password, or a stored Argon2 hash that is truncated/corrupt.
+        return False
+    except InvalidHashError:
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(stored_hash, legacy)
+
+
+def needs_rehash(stored_hash):
+    """True for legacy SHA256 digests and Argon2 hashes with outdated parameters."""
+    try:
+        return PASSWORD_HASHER.check_needs_rehash(str(stored_hash))
+    except InvalidHashError:
+        return True
+
+
+class LabWorker:
+    """Persistent fork server (lab_worker.py) that runs lab code.
+
+    The server stays warm, so Python's startup cost is paid once, and forks a
+    fresh child for every submission. Runs from concurrent Streamlit sessions
+    proceed side by side; each request carries an id and a reader thread
+    hands every reply to the run waiting on that id.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.proc = None
+        self.ids = itertools.count()
+        self.pending = {}  # request id -> (server process, reply queue)
+
+    def _start(self):
+        self.proc = subprocess.Popen([sys.executable, WORKER_PATH],
+                                     stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE,
+                                     text=True,
+                                     env=dict(os.environ, PYTHONHASHSEED="0"),
+                                     start_new_session=True)
+        threading.Thread(target=self._read_replies, args=(self.proc,),
+                         daemon=True).start()
+
+    def _read_replies(self, proc):
+        for line in proc.stdout:
+            reply = json.loads(line)
+            with self.lock:
+                waiter = self.pending.pop(reply["id"], None)
+            if waiter is not None:
+                waiter[1].put(reply)
+        # The server exited; wake every run still waiting on it.
+        with self.lock:
+            orphaned = [request_id for request_id, (owner, _) in self.pending.items()
+                        if owner is proc]
+            for request_id in orphaned:
+                self.pending.pop(request_id)[1].put(None)
+
+    def _stop(self, proc):
+        # The server leads its own process group; take its children down with it.
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+        if self.proc is proc:
+            self.proc = None
+
+    def run(self, code, timeout):
+        """Execute ``code`` and return its ``(stdout, stderr)``.
+
+        Raises ``subprocess.TimeoutExpired`` if it runs longer than ``timeout``
+        seconds. If the server itself dies or hangs it is replaced on the
+        next run.
+        """
+        replies = queue.Queue(maxsize=1)
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._start()
+            proc, request_id = self.proc, next(self.ids)
+            self.pending[request_id] = (proc, replies)
+            try:
+                proc.stdin.write(json.dumps({"id": request_id, "code": code,
+                                             "timeout": timeout}) + "\n")
+                proc.stdin.flush()
+            except OSError:
+                self.pending.pop(request_id)
+                self._stop(proc)
+                return "", "Error: the Python process exited unexpectedly."
+        try:
+            reply = replies.get(timeout=timeout + WORKER_GRACE)
+        except queue.Empty:
+            # The server missed its own deadline, so it is wedged; replace it.
+            with self.lock:
+                self.pending.pop(request_id, None)
+                self._stop(proc)
+            raise subprocess.TimeoutExpired(WORKER_PATH, timeout)
+        if reply is None:
+            with self.lock:
+                self._stop(proc)
+            return "", "Error: the Python process exited unexpectedly."
+        if reply["status"] == "timeout":
+            raise subprocess.TimeoutExpired(WORKER_PATH, timeout)
+        return reply["stdout"], reply["stderr"]
+
+
+@st.cache_resource
+def get_lab_worker():
+    return LabWorker()
+
+
+def run_in_subprocess(code, timeout):
+    """Run ``code`` in a one-off interpreter and return its ``(stdout, stderr)``.
+
+    Slower than the fork server, but works on platforms without os.fork.
+    """
+    proc = subprocess.run([sys.executable, "-"],
+                          input=code,
+                          capture_output=True,
+                          encoding="utf-8",
+                          errors="replace",
+                          env=dict(os.environ, PYTHONIOENCODING="utf-8",
+                                   PYTHONHASHSEED="0"),
+                          timeout=timeout)
+    return proc.stdout, proc.stderr
+
+
+class OutputCache:
+    """Thread-safe LRU of outputs keyed by the SHA-256 digest of their code."""
+
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        self.size = size
+        self.outputs = collections.OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            output = self.outputs.get(key)
+            if output is not None:
+                self.outputs.move_to_end(key)
+            return output
+
+    def put(self, key, output):
+        with self.lock:
+            self.outputs[key] = output
+            self.outputs.move_to_end(key)
+            if len(self.outputs) > self.size:
+                self.outputs.popitem(last=False)
+
+
+@st.cache_resource
+def get_output_cache():
+    return OutputCache(OUTPUT_CACHE_SIZE)
+
+
+def is_replayable(code):
+    """Whether ``code`` should print the same thing every time it runs.
+
+    Accepts code that imports nothing, calls only PURE_BUILTINS or names it
+    binds itself, and never touches hidden attributes. Runs use a fixed hash
+    seed, so set ordering is stable too. This is a static check: it rules out
+    files, clocks, randomness and the environment, not every conceivable
+    trick.
+    """
+    try:
+        top = compile(code, "<lab>", "exec")
+    except (SyntaxError, ValueError):
+        return False
+    bound, loaded = set(), set()
+    pending = [top]
+    while pending:
+        co = pending.pop()
+        pending.extend(c for c in co.co_consts if isinstance(c, types.CodeType))
+        for ins in dis.get_instructions(co):
+            if ins.opname.startswith("IMPORT_"):
+                return False
+            if ins.opname in ("LOAD_ATTR", "LOAD_METHOD", "LOAD_SUPER_ATTR",
+                              "STORE_ATTR", "DELETE_ATTR"):
+                if ins.argval.startswith(HIDDEN_ATTR_PREFIXES):
+                    return False
+            elif ins.opname in ("STORE_NAME", "STORE_GLOBAL",
+                                "DELETE_NAME", "DELETE_GLOBAL"):
+                bound.add(ins.argval)
+            elif ins.opname in ("LOAD_NAME", "LOAD_GLOBAL",
+                                "LOAD_FROM_DICT_OR_GLOBALS"):
+                loaded.add(ins.argval)
+    # A name bound only on some paths still falls through to the builtin.
+    if bound & (set(dir(builtins)) - PURE_BUILTINS):
+        return False
+    # __name__ is always "__main__"; class bodies read it implicitly.
+    return loaded <= PURE_BUILTINS | bound | {"__name__"}
 
 
 def execute_python_code(code, timeout=5):
     """Run Python code safely (basic sandbox)."""
     code = textwrap.dedent(code)
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".py") as t:
-        t.write(code.encode())
-        t.flush()
-        temp_path = t.name
+    # Only code that cannot see files, clocks or randomness is cached; see
+    # is_replayable for what that check does and does not cover.
+    cacheable = is_replayable(code)
+    if cacheable:
+        key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).digest()
+        output = get_output_cache().get(key)
+        if output is not None:
+            return output
     try:
-        proc = subprocess.run(["python", temp_path],
-                              capture_output=True,
-                              text=True,
-                              timeout=timeout)
-        out = proc.stdout.strip()
-        err = proc.stderr.strip()
-        return out if out else err if err else "(No output)"
+        if HAVE_FORK:
+            out, err = get_lab_worker().run(code, timeout)
+        else:
+            out, err = run_in_subprocess(code, timeout)
     except subprocess.TimeoutExpired:
         return "⏱️ Error: Code execution timed out!"
-    finally:
-        try:
-            os.remove(temp_path)
-        except Exception:
-            pass
+    out = out.strip()
+    err = err.strip()
+    output = out if out else err if err else "(No output)"
+    # Errors, crashes and timeouts are never cached, so a rerun gets a fresh try.
+    # Default reprs embed memory addresses, which differ from run to run.
+    if cacheable and out and not err and " at 0x" not in out:
+        get_output_cache().put(key, output)
+    return output
+
+
+@st.cache_resource
+def get_matcher(lab_id, expected_output):
+    """Generate a grading function with the lab's expected output folded in.
+
+    The returned ``match(output)`` takes output as returned by
+    execute_python_code, which is already stripped.
+    """
+    expected = str(expected_output).strip()
+    source = f"def match(output):\n    return output == {expected!r}\n"
+    namespace = {}
+    exec(compile(source, f"<matcher lab {lab_id}>", "exec"), namespace)
+    return namespace["match"]
 
 
-def init_csv(path, columns, defaults=None):
-    """Create CSV if missing, or add missing columns if exists."""
-    if not os.path.exists(path):
-        df = pd.DataFrame(defaults or [], columns=columns)
-        df.to_csv(path, index=False)
-        return df
-    else:
-        df = pd.read_csv(path)
-        # Automatically add missing columns
-        for col in columns:
-            if col not in df.columns:
-                df[col] = ""
-        df.to_csv(path, index=False)
-        return df
-
 def load_csv(path):
-    return pd.read_csv(path)
+    """Read a legacy CSV with Arrow's multithreaded parser.
 
+    Every column is read as text and left to the SQLite column affinity to
+    convert, rather than relying on per-column type inference.
+    """
+    return pd.read_csv(path, engine="pyarrow", dtype=str)
 
-def save_csv(df, path):
-    df.to_csv(path, index=False)
 
-# ---------------------------------------------------------
-# INITIAL DATA CREATION
-# ---------------------------------------------------------
-users = init_csv(USERS_CSV, ["id", "name", "email", "password_hash", "role"], [
-    [1, "Instructor", "instructor@gmail.com", hash_password("password"), "instructor"]
-])
-
-labs = init_csv(LABS_CSV, ["lab_id", "title", "description", "expected_output"], [
-    [1, "Basic Python", "Print statements and variables", "Hello World"]
-])
+def seed_table(con, table, columns, csv_path, defaults=None):
+    """Fill an empty table from its legacy CSV file, or else from ``defaults``.
 
-sessions = init_csv(SESSIONS_CSV, ["session_id", "user_id", "lab_id", "code", "output", "score", "timestamp"])
+    ``defaults`` may be a callable, so seed rows that are costly to build
+    (password hashes) are only computed when they are actually inserted.
+    """
+    if con.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+        return
+    if os.path.exists(csv_path):
+        df = load_csv(csv_path).reindex(columns=columns).astype(object)
+        rows = df.where(df.notna(), None).values.tolist()
+    else:
+        rows = defaults() if callable(defaults) else defaults or []
+    placeholders = ", ".join("?" * len(columns))
+    with con:
+        con.executemany(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            rows)
+
+
+def connect():
+    con = sqlite3.connect(DB_PATH)
+    con.row_factory = sqlite3.Row
+    return con
+
+
+@st.cache_resource
+def init_db():
+    """Create and seed the database once per process."""
+    con = connect()
+    # Readers on other threads' connections do not block the writer.
+    con.execute("PRAGMA journal_mode=WAL")
+    con.executescript(SCHEMA)
+    seed_table(con, "users", ["id", "name", "email", "password_hash", "role"], USERS_CSV, lambda: [
+        [1, "Instructor", "instructor@gmail.com", hash_password("password"), "instructor"]
+    ])
+    seed_table(con, "labs", ["lab_id", "title", "description", "expected_output"], LABS_CSV, [
+        [1, "Basic Python", "Print statements and variables", "Hello World"]
+    ])
+    seed_table(con, "sessions", ["session_id", "user_id", "lab_id", "code", "output", "score", "timestamp"],
+               SESSIONS_CSV)
+    # Rows imported from the legacy CSV hold local "YYYY-MM-DD HH:MM:SS" text.
+    # Text sorts after every number in SQLite, so this range only visits
+    # those rows, via ix_sessions_timestamp.
+    with con:
+        con.execute("UPDATE sessions SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER) "
+                    "WHERE timestamp >= ''")
+    con.close()
+
+
+@st.cache_resource
+def get_thread_connections():
+    return threading.local()
+
+
+def get_connection():
+    """Return this thread's database connection, opening it on first use.
+
+    Transactions belong to a connection, so Streamlit session threads must not
+    share one: a rollback in one thread would discard another's writes.
+    """
+    connections = get_thread_connections()
+    con = getattr(connections, "con", None)
+    if con is None:
+        init_db()
+        con = connections.con = connect()
+    return con
+
+
+def query_df(sql, params=()):
+    return pd.read_sql_query(sql, get_connection(), params=params)
 
 # ---------------------------------------------------------
 # AUTHENTICATION
@@ -91,12 +433,17 @@ def login():
     email = st.text_input("Email")
     password = st.text_input("Password", type="password")
     if st.button("Login"):
-        df = load_csv(USERS_CSV)
-        hashed = hash_password(password)
-        user = df[(df["email"] == email) & (df["password_hash"] == hashed)]
-        if not user.empty:
-            st.session_state["user"] = user.iloc[0].to_dict()
-            st.success(f"Welcome, {user.iloc[0]['name']}!")
+        con = get_connection()
+        user = con.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+        if user and verify_password(user["password_hash"], password):
+            if needs_rehash(user["password_hash"]):
+                # The plain password is only available here, so upgrade the
+                # stored hash now.
+                with con:
+                    con.execute("UPDATE users SET password_hash = ? WHERE id = ?",
+                                (hash_password(password), user["id"]))
+            st.session_state["user"] = dict(user)
+            st.success(f"Welcome, {user['name']}!")
             st.rerun()
         else:
             st.error("Invalid email or password.")
@@ -108,13 +455,15 @@ def register():
     email = st.text_input("Email")
     password = st.text_input("Password", type="password")
     if st.button("Register"):
-        df = load_csv(USERS_CSV)
-        if email in df["email"].values:
+        try:
+            with get_connection() as con:
+                con.execute(
+                    "INSERT INTO users (name, email, password_hash, role) VALUES (?, ?, ?, ?)",
+                    (name, email, hash_password(password), "student"))
+        except sqlite3.IntegrityError:
+            # ix_users_email is unique, so the insert itself rejects duplicates.
             st.warning("Email already registered.")
         else:
-            new_id = int(df["id"].max()) + 1 if not df.empty else 1
-            df.loc[len(df)] = [new_id, name, email, hash_password(password), "student"]
-            save_csv(df, USERS_CSV)
             st.success("Registration successful! Please login.")
 
 # ---------------------------------------------------------
@@ -122,8 +471,8 @@ def register():
 # ---------------------------------------------------------
 def dashboard():
     st.title("📚 Dashboard")
-    labs_df = load_csv(LABS_CSV)
-    st.table(labs_df[["lab_id", "title", "description", "expected_output"]])
+    labs_df = query_df("SELECT lab_id, title, description, expected_output FROM labs")
+    st.table(labs_df)
     user = st.session_state["user"]
 
     if user["role"] == "instructor":
@@ -133,9 +482,10 @@ def dashboard():
         expected_output = st.text_input("Expected Output (for grading)")
         if st.button("Create Lab"):
             if new_title.strip():
-                new_id = int(labs_df["lab_id"].max()) + 1 if not labs_df.empty else 1
-                labs_df.loc[len(labs_df)] = [new_id, new_title, new_desc, expected_output]
-                save_csv(labs_df, LABS_CSV)
+                with get_connection() as con:
+                    con.execute(
+                        "INSERT INTO labs (title, description, expected_output) VALUES (?, ?, ?)",
+                        (new_title, new_desc, expected_output))
                 st.success("New lab added successfully!")
                 st.rerun()
             else:
@@ -145,7 +495,7 @@ def dashboard():
 def start_lab():
     st.title("💻 Start a Lab Session")
     user = st.session_state["user"]
-    labs_df = load_csv(LABS_CSV)
+    labs_df = query_df("SELECT * FROM labs")
 
     chosen_lab = st.selectbox("Select Lab", labs_df["title"].tolist())
     lab = labs_df[labs_df["title"] == chosen_lab].iloc[0]
@@ -158,7 +508,7 @@ def start_lab():
     if col1.button("▶️ Run Code"):
         output = execute_python_code(code)
         st.text_area("Output", output, height=200)
-        score = 100 if str(output).strip() == str(lab["expected_output"]).strip() else 0
+        score = 100 * get_matcher(int(lab["lab_id"]), lab["expected_output"])(output)
         st.info(f"Auto-graded Score: {score}/100")
         save_session(user["id"], lab["lab_id"], code, output, score)
         st.success("Session saved successfully!")
@@ -169,50 +519,61 @@ def start_lab():
 
 
 def save_session(user_id, lab_id, code, output, score):
-    df = load_csv(SESSIONS_CSV)
-    new_id = int(df["session_id"].max()) + 1 if not df.empty else 1
-    df.loc[len(df)] = [
-        new_id, user_id, lab_id, code, output,
-        score if score != "" else None,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    ]
-    save_csv(df, SESSIONS_CSV)
+    with get_connection() as con:
+        con.execute(
+            "INSERT INTO sessions (user_id, lab_id, code, output, score, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (int(user_id), int(lab_id), code, output,
+             score if score != "" else None,
+             int(time.time())))
 
 
 def my_sessions():
     st.title("🗂️ My Sessions")
     user = st.session_state["user"]
-    df = load_csv(SESSIONS_CSV)
-    my = df[df["user_id"] == user["id"]]
+    my = query_df("""
+        SELECT session_id, user_id, lab_id, code, output, score,
+               datetime(timestamp, 'unixepoch', 'localtime') AS timestamp
+        FROM sessions
+        WHERE user_id = ?
+        ORDER BY sessions.timestamp DESC, session_id DESC
+    """, (int(user["id"]),))
     if my.empty:
         st.info("No lab sessions yet.")
     else:
-        st.dataframe(my.sort_values("timestamp", ascending=False))
+        st.dataframe(my)
 
 # ---------------------------------------------------------
 # 📊 INSTRUCTOR GRADING DASHBOARD
 # ---------------------------------------------------------
 def grading_dashboard():
     st.title("📊 Instructor Grading Dashboard")
-    users_df = load_csv(USERS_CSV)
-    sessions_df = load_csv(SESSIONS_CSV)
-    labs_df = load_csv(LABS_CSV)
-
-    merged = sessions_df.merge(users_df, left_on="user_id", right_on="id", how="left")
-    merged = merged.merge(labs_df, on="lab_id", how="left")
-    merged_view = merged[["session_id", "name", "email", "title", "output", "score", "timestamp"]]
+    total = get_connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
 
-    if merged_view.empty:
+    if total == 0:
         st.info("No student submissions yet.")
     else:
-        st.dataframe(merged_view.sort_values("timestamp", ascending=False))
+        pages = (total - 1) // GRADING_PAGE_SIZE + 1
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1)
+        merged_view = query_df("""
+            SELECT s.session_id, u.name, u.email, l.title, s.output, s.score,
+                   datetime(s.timestamp, 'unixepoch', 'localtime') AS timestamp
+            FROM sessions s
+            LEFT JOIN users u ON s.user_id = u.id
+            LEFT JOIN labs l ON s.lab_id = l.lab_id
+            ORDER BY s.timestamp DESC, s.session_id DESC
+            LIMIT ? OFFSET ?
+        """, (GRADING_PAGE_SIZE, (page - 1) * GRADING_PAGE_SIZE))
+        st.caption(f"Page {page} of {pages} ({total} submissions)")
+        st.dataframe(merged_view)
         st.subheader("📝 Update a Student Score")
         sid = st.number_input("Enter Session ID to Update", min_value=1, step=1)
         new_score = st.number_input("New Score", 0, 100, 0)
         if st.button("Update Score"):
-            if sid in merged_view["session_id"].values:
-                sessions_df.loc[sessions_df["session_id"] == sid, "score"] = new_score
-                save_csv(sessions_df, SESSIONS_CSV)
+            with get_connection() as con:
+                updated = con.execute("UPDATE sessions SET score = ? WHERE session_id = ?",
+                                      (new_score, sid)).rowcount
+            if updated:
                 st.success(f"Score for session {sid} updated to {new_score}.")
                 st.rerun()
             else:
@@ -225,7 +586,7 @@ def about():
     st.title("ℹ️ About This Project")
     st.markdown("""
     **Cloud-Based Virtual Laboratory**  
-    🔐 Secure password hashing (SHA256)  
+    🔐 Secure password hashing (Argon2)  
     🧮 Auto-grading system (expected output matching)  
     📊 Instructor grading dashboard (view + edit scores)  
     💾 Data stored in a Cloud  
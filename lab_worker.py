@@ -0,0 +1,184 @@
+"""Long-lived fork server that runs lab submissions for app.py.
+
+The app writes one JSON request per line to stdin,
+``{"id": 1, "code": "...", "timeout": 5}``, and reads one JSON reply per line,
+``{"id": 1, "status": "ok" | "timeout" | "crashed", "stdout": "...", "stderr": "..."}``.
+Replies arrive in completion order, not request order.
+
+Every submission runs in a freshly forked child that exits afterwards, so
+the warm interpreter is shared copy-on-write but nothing a submission does
+(patching builtins, this module, imported modules) outlives it.
+
+Needs os.fork, so it is POSIX only; without it app.py falls back to starting
+a new interpreter per run.
+"""
+import collections
+import contextlib
+import hashlib
+import io
+import json
+import linecache
+import os
+import select
+import signal
+import sys
+import time
+import traceback
+
+FILENAME = "<lab>"
+# Students tend to resubmit the same code; the server keeps this many
+# compiled submissions around, evicting the least recently used. Children
+# only see a copy-on-write snapshot, so user code cannot alter the cache.
+COMPILE_CACHE_SIZE = 128
+
+_compiled = collections.OrderedDict()
+
+
+def compile_code(code):
+    """Compile ``code``, reusing the code object of an identical submission."""
+    key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).digest()
+    if key in _compiled:
+        _compiled.move_to_end(key)
+        return _compiled[key]
+    compiled = compile(code, FILENAME, "exec")
+    _compiled[key] = compiled
+    if len(_compiled) > COMPILE_CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return compiled
+
+
+def run_code(compiled, code):
+    """Execute ``compiled`` (from ``code``) and return its (stdout, stderr)."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    # Let tracebacks show the offending source lines, as `python file.py` does.
+    lines = (code + "\n").splitlines(True)
+    linecache.cache[FILENAME] = (len(code), None, lines, FILENAME)
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            exec(compiled, {"__name__": "__main__"})
+        except SystemExit as exc:
+            if exc.code is not None and not isinstance(exc.code, int):
+                print(exc.code, file=sys.stderr)
+        except BaseException as exc:
+            # Drop the worker's own frames so the traceback starts at the lab code.
+            tb = exc.__traceback__
+            while tb is not None and tb.tb_frame.f_code.co_filename != FILENAME:
+                tb = tb.tb_next
+            traceback.print_exception(type(exc), exc, tb)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+class Child:
+    """A forked child running one submission."""
+
+    def __init__(self, request_id, pid, deadline):
+        self.request_id = request_id
+        self.pid = pid
+        self.deadline = deadline
+        self.chunks = []
+
+
+class ForkServer:
+    """Forks a child per request and replies as each one finishes.
+
+    Several submissions can be in flight at once, so one student's endless
+    loop does not hold up anyone else's run.
+    """
+
+    def __init__(self, requests_fd, replies):
+        self.requests_fd = requests_fd
+        self.replies = replies
+        self.pending = b""
+        self.children = {}  # pipe read fd -> Child
+
+    def reply(self, request_id, reply):
+        reply["id"] = request_id
+        self.replies.write(json.dumps(reply) + "\n")
+        self.replies.flush()
+
+    def start(self, request):
+        code = request["code"]
+        try:
+            # Compiled here rather than in the child so the cache survives it.
+            compiled = compile_code(code)
+        except Exception as exc:
+            error = "".join(traceback.format_exception_only(type(exc), exc))
+            self.reply(request["id"], {"status": "ok", "stdout": "", "stderr": error})
+            return
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                for fd in [self.requests_fd, self.replies.fileno(), *self.children]:
+                    os.close(fd)
+                out, err = run_code(compiled, code)
+                with os.fdopen(write_fd, "w") as result:
+                    json.dump({"status": "ok", "stdout": out, "stderr": err}, result)
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        self.children[read_fd] = Child(request["id"], pid, time.monotonic() + request["timeout"])
+
+    def finish(self, read_fd, timed_out=False):
+        child = self.children.pop(read_fd)
+        if timed_out:
+            os.kill(child.pid, signal.SIGKILL)
+        os.close(read_fd)
+        os.waitpid(child.pid, 0)
+        if timed_out:
+            reply = {"status": "timeout", "stdout": "", "stderr": ""}
+        else:
+            try:
+                reply = json.loads(b"".join(child.chunks))
+            except ValueError:
+                # The child died (os._exit, a signal, the OOM killer) before replying.
+                reply = {"status": "crashed", "stdout": "",
+                         "stderr": "Error: the Python process exited unexpectedly."}
+        self.reply(child.request_id, reply)
+
+    def read_requests(self):
+        """Start every complete request line; False once the app has gone away."""
+        data = os.read(self.requests_fd, 65536)
+        if not data:
+            return False
+        *lines, self.pending = (self.pending + data).split(b"\n")
+        for line in lines:
+            self.start(json.loads(line))
+        return True
+
+    def serve(self):
+        while True:
+            now = time.monotonic()
+            for read_fd, child in list(self.children.items()):
+                if child.deadline <= now:
+                    self.finish(read_fd, timed_out=True)
+            deadlines = [child.deadline for child in self.children.values()]
+            wait = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready, _, _ = select.select([self.requests_fd, *self.children], [], [], wait)
+            for fd in ready:
+                if fd == self.requests_fd:
+                    if not self.read_requests():
+                        for read_fd in list(self.children):
+                            self.finish(read_fd, timed_out=True)
+                        return
+                else:
+                    chunk = os.read(fd, 65536)
+                    if chunk:
+                        self.children[fd].chunks.append(chunk)
+                    else:
+                        self.finish(fd)
+
+
+def main():
+    requests_fd = sys.stdin.fileno()
+    # Replies go over a private copy of stdout; fd 1 itself is pointed at
+    # /dev/null so user code writing to it directly cannot corrupt the protocol.
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.stdin = io.StringIO()
+    ForkServer(requests_fd, replies).serve()
+
+
+if __name__ == "__main__":
+    main()